@@ -25,65 +25,168 @@
  */
 
 import fs from 'fs';
+import os from 'os';
 import path from 'path';
-import { glob } from 'glob';
+import crypto from 'crypto';
+import { Worker, isMainThread, parentPort, workerData } from 'worker_threads';
 import Papa from 'papaparse';
 import dotenv from 'dotenv';
 
 // Load environment variables
 dotenv.config();
 
+// Files larger than this are counted in parallel across worker threads
+const PARALLEL_MIN_BYTES = 64 * 1024 * 1024;
+const MAX_WORKERS = 8;
+
+// Result of findCatalogProductFile, memoized for the process lifetime
+let cachedCatalogProductFile;
+
+/**
+ * Recursively collect candidate catalog product CSV files in one walk.
+ * Hidden directories, node_modules and .git are skipped.
+ *
+ * @param {string} dir - Directory to walk
+ * @param {string[]} results - Accumulator for relative file paths
+ */
+function walkCsvCandidates(dir, results) {
+    let entries;
+    try {
+        entries = fs.readdirSync(dir, { withFileTypes: true });
+    } catch (error) {
+        return; // Unreadable directory, skip it
+    }
+
+    for (const entry of entries) {
+        if (entry.name.startsWith('.') || entry.name === 'node_modules') {
+            continue;
+        }
+        const fullPath = path.join(dir, entry.name);
+        if (entry.isDirectory()) {
+            walkCsvCandidates(fullPath, results);
+        } else if (entry.isFile() && entry.name.endsWith('.csv') && entry.name.includes('catalog_product')) {
+            results.push(fullPath);
+        }
+    }
+}
+
+/**
+ * Classify a candidate file into a priority bucket matching the original
+ * search pattern order. Returns -1 for files that match no pattern.
+ *
+ * @param {string} filePath - Relative path of the candidate
+ * @returns {number} Bucket index (lower is higher priority) or -1
+ */
+function classifyCandidate(filePath) {
+    const name = path.basename(filePath);
+    const dir = path.dirname(filePath);
+    const inRoot = dir === '.';
+
+    if (inRoot && name.startsWith('export_catalog_product')) return 0;
+    if (name.startsWith('catalog_product') && /(^|\/)export$/.test(dir)) return 1;
+    if (name.startsWith('catalog_product') && /(^|\/)var\/export$/.test(dir)) return 2;
+    if (name === 'export_catalog_product.csv') return 3;
+    if (inRoot && name.startsWith('catalog_product')) return 4;
+    if (name.startsWith('catalog_product')) return 5;
+    return -1;
+}
+
 /**
  * Find the catalog product CSV file in the current directory structure.
+ * Walks the tree once, classifies candidates by the historical pattern
+ * priority, and returns the most recent file from the best bucket.
  * @returns {string|null} Path to the found CSV file or null
  */
 async function findCatalogProductFile() {
-    // Prioritize patterns that are most likely to be the export files
-    const searchPatterns = [
-        "export_catalog_product*.csv",
-        "**/export/catalog_product*.csv",
-        "**/var/export/catalog_product*.csv",
-        "export_catalog_product.csv",
-        "**/export_catalog_product.csv",
-        "catalog_product*.csv",
-        "**/catalog_product*.csv"
-    ];
-    
-    for (const pattern of searchPatterns) {
-        try {
-            const files = await glob(pattern);
-            // Filter out test files that are likely not the main export
-            const filteredFiles = files.filter(f => 
-                !f.toLowerCase().includes('test') && 
-                !f.toLowerCase().includes('sample')
-            );
-            
-            if (filteredFiles.length > 0) {
-                // Return the most recent file if multiple found
-                const fileStats = filteredFiles.map(f => ({
-                    file: f,
-                    mtime: fs.statSync(f).mtime
-                }));
-                fileStats.sort((a, b) => b.mtime - a.mtime);
-                return fileStats[0].file;
-            } else if (files.length > 0) {
-                // Fallback to all files if no non-test files found
-                const fileStats = files.map(f => ({
-                    file: f,
-                    mtime: fs.statSync(f).mtime
-                }));
-                fileStats.sort((a, b) => b.mtime - a.mtime);
-                return fileStats[0].file;
-            }
-        } catch (error) {
-            // Continue to next pattern if this one fails
+    if (cachedCatalogProductFile !== undefined) {
+        return cachedCatalogProductFile;
+    }
+
+    const candidates = [];
+    walkCsvCandidates('.', candidates);
+
+    const buckets = [];
+    for (const file of candidates) {
+        const bucket = classifyCandidate(file);
+        if (bucket !== -1) {
+            (buckets[bucket] = buckets[bucket] || []).push(file);
+        }
+    }
+
+    for (const bucket of buckets) {
+        if (!bucket || bucket.length === 0) {
             continue;
         }
+        // Filter out test files that are likely not the main export,
+        // falling back to all files if nothing else matched
+        const nonTestFiles = bucket.filter(f =>
+            !f.toLowerCase().includes('test') &&
+            !f.toLowerCase().includes('sample')
+        );
+        const pool = nonTestFiles.length > 0 ? nonTestFiles : bucket;
+
+        // Return the most recent file if multiple found
+        const fileStats = pool.map(f => ({
+            file: f,
+            mtime: fs.statSync(f).mtime
+        }));
+        fileStats.sort((a, b) => b.mtime - a.mtime);
+        cachedCatalogProductFile = fileStats[0].file;
+        return cachedCatalogProductFile;
     }
-    
+
+    cachedCatalogProductFile = null;
     return null;
 }
 
+// On-disk header cache: repeated invocations against the same big export
+// can skip opening and parsing the file entirely. Entries are keyed by
+// (real path, mtime, size, delimiter) so any change to the file misses.
+const HEADER_CACHE_DIR = path.join(os.homedir(), '.cache', 'magento_csv_headers');
+
+/**
+ * Compute the cache file path for a CSV file's headers.
+ * @param {string} filePath - Path to the CSV file
+ * @param {string} delimiter - CSV delimiter
+ * @returns {string} Path of the cache entry
+ */
+function headerCachePath(filePath, delimiter) {
+    const stat = fs.statSync(filePath);
+    const key = `${fs.realpathSync(filePath)}|${stat.mtimeMs}|${stat.size}|${delimiter}`;
+    const digest = crypto.createHash('sha1').update(key).digest('hex');
+    return path.join(HEADER_CACHE_DIR, `${digest}.json`);
+}
+
+/**
+ * Load cached headers for a CSV file, if present.
+ * @param {string} filePath - Path to the CSV file
+ * @param {string} delimiter - CSV delimiter
+ * @returns {string[]|null} Cached headers or null on miss
+ */
+function readHeaderCache(filePath, delimiter) {
+    try {
+        const cached = JSON.parse(fs.readFileSync(headerCachePath(filePath, delimiter), 'utf-8'));
+        return Array.isArray(cached) ? cached : null;
+    } catch (error) {
+        return null;
+    }
+}
+
+/**
+ * Store headers in the on-disk cache. Best effort: failures are ignored.
+ * @param {string} filePath - Path to the CSV file
+ * @param {string} delimiter - CSV delimiter
+ * @param {string[]} headers - Headers to cache
+ */
+function writeHeaderCache(filePath, delimiter, headers) {
+    try {
+        fs.mkdirSync(HEADER_CACHE_DIR, { recursive: true });
+        fs.writeFileSync(headerCachePath(filePath, delimiter), JSON.stringify(headers), 'utf-8');
+    } catch (error) {
+        // The cache is an optimization only - never fail the run for it
+    }
+}
+
 /**
  * Get the column headers from the CSV file.
  * @param {string} filePath - Path to the CSV file
@@ -93,15 +196,25 @@ async function findCatalogProductFile() {
 async function getCsvHeaders(filePath, delimiter = ',') {
     return new Promise((resolve, reject) => {
         try {
-            const fileContent = fs.readFileSync(filePath, 'utf-8');
-            
-            Papa.parse(fileContent, {
+            const cachedHeaders = readHeaderCache(filePath, delimiter);
+            if (cachedHeaders) {
+                resolve(cachedHeaders);
+                return;
+            }
+
+            // Stream with preview: 1 so only the first record is ever read;
+            // loading the whole file just for row 0 breaks on multi-GB
+            // exports that exceed Node's string size limit
+            const stream = fs.createReadStream(filePath, { encoding: 'utf-8' });
+
+            Papa.parse(stream, {
                 header: false,
                 delimiter: delimiter,
                 preview: 1, // Only read the first row
                 complete: (results) => {
                     if (results.data && results.data.length > 0) {
                         const headers = results.data[0].map(h => h.trim());
+                        writeHeaderCache(filePath, delimiter, headers);
                         resolve(headers);
                     } else {
                         resolve([]);
@@ -119,56 +232,442 @@ async function getCsvHeaders(filePath, delimiter = ',') {
     });
 }
 
+/**
+ * Trim a value only when its boundary characters need it. Catalog values
+ * are usually already clean, and skipping trim() for those avoids
+ * allocating a copy of every string in the hot loop. Covers ASCII
+ * whitespace and non-breaking spaces, the only kinds seen in exports.
+ *
+ * @param {string} value - Raw field value
+ * @returns {string} Trimmed value
+ */
+function fastTrim(value) {
+    const first = value.charCodeAt(0);
+    const last = value.charCodeAt(value.length - 1);
+    if (first > 32 && first !== 160 && last > 32 && last !== 160) {
+        return value;
+    }
+    return value.trim();
+}
+
+/**
+ * Scan the file once and find byte offsets where it can be split into
+ * roughly equal slices for parallel processing. Split points are placed
+ * just after a newline seen at even quote parity, so every slice starts
+ * at a record boundary and quoted multiline fields are never cut.
+ *
+ * @param {string} filePath - Path to the CSV file
+ * @param {number} sliceCount - Desired number of slices
+ * @returns {Promise<{offsets: number[], hasQuotes: boolean}|null>} Sorted
+ *          offsets (first is the end of the header row) plus whether any
+ *          quote character was seen, or null if the quote structure looks
+ *          unbalanced
+ */
+function findSplitOffsets(filePath, sliceCount) {
+    return new Promise((resolve, reject) => {
+        const fileSize = fs.statSync(filePath).size;
+        const targets = [];
+        for (let i = 1; i < sliceCount; i++) {
+            targets.push(Math.floor((fileSize * i) / sliceCount));
+        }
+
+        const stream = fs.createReadStream(filePath, { highWaterMark: 8 * 1024 * 1024 });
+        const offsets = [];
+        let headerEnd = -1;
+        let position = 0;
+        let inQuotes = false;
+        let sawQuote = false;
+        let nextTarget = 0;
+
+        stream.on('data', (chunk) => {
+            for (let i = 0; i < chunk.length; i++) {
+                const byte = chunk[i];
+                if (byte === 0x22) { // "
+                    inQuotes = !inQuotes;
+                    sawQuote = true;
+                } else if (byte === 0x0A && !inQuotes) { // \n
+                    const recordStart = position + i + 1;
+                    if (headerEnd === -1) {
+                        headerEnd = recordStart;
+                    }
+                    while (nextTarget < targets.length && recordStart > targets[nextTarget]) {
+                        offsets.push(recordStart);
+                        nextTarget++;
+                    }
+                }
+            }
+            position += chunk.length;
+        });
+
+        stream.on('end', () => {
+            // Unbalanced quotes mean the parity scan cannot be trusted
+            if (inQuotes || headerEnd === -1) {
+                resolve(null);
+                return;
+            }
+            resolve({ offsets: [headerEnd, ...offsets], hasQuotes: sawQuote });
+        });
+
+        stream.on('error', reject);
+    });
+}
+
+/**
+ * Count the target field of one line into the counts Map. The field is
+ * located by jumping between delimiter positions with indexOf, so only
+ * the target column's characters are ever copied out of the line.
+ *
+ * @param {string} text - Buffered text containing the line
+ * @param {number} lineStart - Start offset of the line within text
+ * @param {number} lineEnd - End offset of the line (exclusive, before \n)
+ * @param {number} columnIndex - Index of the column to count
+ * @param {string} delimiter - CSV delimiter
+ * @param {Map<string, number>} valueCounts - Counts accumulator
+ */
+function countLineValue(text, lineStart, lineEnd, columnIndex, delimiter, valueCounts) {
+    let fieldStart = lineStart;
+    for (let i = 0; i < columnIndex; i++) {
+        const at = text.indexOf(delimiter, fieldStart);
+        if (at === -1 || at >= lineEnd) {
+            return; // Ragged row, shorter than the header
+        }
+        fieldStart = at + delimiter.length;
+    }
+
+    let fieldEnd = text.indexOf(delimiter, fieldStart);
+    if (fieldEnd === -1 || fieldEnd > lineEnd) {
+        fieldEnd = lineEnd;
+    }
+    if (fieldEnd > fieldStart && text.charCodeAt(fieldEnd - 1) === 13) {
+        fieldEnd--; // Drop a trailing \r
+    }
+    if (fieldEnd <= fieldStart) {
+        return;
+    }
+
+    const value = fastTrim(text.slice(fieldStart, fieldEnd));
+    if (value) {
+        valueCounts.set(value, (valueCounts.get(value) || 0) + 1);
+    }
+}
+
+/**
+ * Count values of one column within a byte slice of a CSV file that is
+ * known to contain no quote characters. Skips the CSV state machine
+ * entirely: lines are located with indexOf (native memchr) and only the
+ * target field is materialized per line. This is the closest this tree
+ * gets to the dedicated native tokenizer used by columnar engines.
+ *
+ * @param {string} filePath - Path to the CSV file
+ * @param {number} start - Byte offset of the first record in the slice
+ * @param {number} end - Byte offset just past the last record
+ * @param {number} columnIndex - Index of the column to count
+ * @param {string} delimiter - CSV delimiter
+ * @returns {Promise<Array<[string, number]>>} Value/count pairs for this slice
+ */
+function countSliceFast(filePath, start, end, columnIndex, delimiter) {
+    return new Promise((resolve, reject) => {
+        const valueCounts = new Map();
+        let carry = '';
+        const stream = fs.createReadStream(filePath, {
+            encoding: 'utf-8',
+            highWaterMark: 4 * 1024 * 1024,
+            start: start,
+            end: end - 1
+        });
+
+        stream.on('data', (chunk) => {
+            const text = carry ? carry + chunk : chunk;
+            let lineStart = 0;
+            let newlineAt;
+            while ((newlineAt = text.indexOf('\n', lineStart)) !== -1) {
+                countLineValue(text, lineStart, newlineAt, columnIndex, delimiter, valueCounts);
+                lineStart = newlineAt + 1;
+            }
+            carry = text.slice(lineStart);
+        });
+
+        stream.on('end', () => {
+            if (carry) {
+                countLineValue(carry, 0, carry.length, columnIndex, delimiter, valueCounts);
+            }
+            resolve(Array.from(valueCounts.entries()));
+        });
+
+        stream.on('error', reject);
+    });
+}
+
+/**
+ * Check whether a file is entirely quote-free. Scans the raw bytes with
+ * indexOf and stops at the first quote character.
+ *
+ * @param {string} filePath - Path to the CSV file
+ * @returns {Promise<number|null>} Offset just past the header row when the
+ *          file has no quotes, null otherwise
+ */
+function probeQuoteFree(filePath) {
+    return new Promise((resolve, reject) => {
+        const stream = fs.createReadStream(filePath, { highWaterMark: 4 * 1024 * 1024 });
+        let headerEnd = -1;
+        let position = 0;
+        let done = false;
+
+        stream.on('data', (chunk) => {
+            if (done) return;
+            if (chunk.indexOf(0x22) !== -1) { // "
+                done = true;
+                stream.destroy();
+                resolve(null);
+                return;
+            }
+            if (headerEnd === -1) {
+                const newlineAt = chunk.indexOf(0x0A); // \n
+                if (newlineAt !== -1) {
+                    headerEnd = position + newlineAt + 1;
+                }
+            }
+            position += chunk.length;
+        });
+
+        stream.on('end', () => {
+            if (!done) {
+                resolve(headerEnd === -1 ? null : headerEnd);
+            }
+        });
+
+        stream.on('error', (error) => {
+            if (!done) reject(error);
+        });
+    });
+}
+
+/**
+ * Resolve the index of a column from the file's headers, printing the
+ * usual diagnostics when it does not exist.
+ *
+ * @param {string} filePath - Path to the CSV file
+ * @param {string} columnName - Name of the column to look up
+ * @param {string} delimiter - CSV delimiter
+ * @returns {Promise<number|null>} Column index, -1 when the column is
+ *          genuinely missing, or null when the headers could not be read
+ *          at all (so the caller can fall back to the full parser)
+ */
+async function resolveColumnIndex(filePath, columnName, delimiter) {
+    const headers = await getCsvHeaders(filePath, delimiter);
+    if (headers.length === 0) {
+        return null;
+    }
+    const columnIndex = headers.indexOf(columnName);
+    if (columnIndex === -1) {
+        console.error(`Error: Column '${columnName}' not found!`);
+        console.error(`Available columns (first 10): ${headers.slice(0, 10).join(', ')}`);
+        if (headers.length > 10) {
+            console.error(`... and ${headers.length - 10} more columns`);
+        }
+    }
+    return columnIndex;
+}
+
+/**
+ * Count values of one column within a byte slice of the CSV file.
+ * Runs inside a worker thread; the slice is known to start and end on
+ * record boundaries.
+ *
+ * @param {string} filePath - Path to the CSV file
+ * @param {number} start - Byte offset of the first record in the slice
+ * @param {number} end - Byte offset just past the last record (file size for the last slice)
+ * @param {number} columnIndex - Index of the column to count
+ * @param {string} delimiter - CSV delimiter
+ * @returns {Promise<Array<[string, number]>>} Value/count pairs for this slice
+ */
+function countSlice(filePath, start, end, columnIndex, delimiter) {
+    return new Promise((resolve, reject) => {
+        const valueCounts = new Map();
+        const stream = fs.createReadStream(filePath, {
+            encoding: 'utf-8',
+            highWaterMark: 4 * 1024 * 1024,
+            start: start,
+            end: end - 1
+        });
+
+        Papa.parse(stream, {
+            header: false,
+            delimiter: delimiter,
+            skipEmptyLines: true,
+            step: (results) => {
+                const row = results.data;
+                const value = columnIndex < row.length ? row[columnIndex] : undefined;
+                if (value) {
+                    const trimmedValue = fastTrim(value);
+                    if (trimmedValue) {
+                        valueCounts.set(trimmedValue, (valueCounts.get(trimmedValue) || 0) + 1);
+                    }
+                }
+            },
+            complete: () => {
+                resolve(Array.from(valueCounts.entries()));
+            },
+            error: (error) => {
+                reject(error);
+            }
+        });
+    });
+}
+
+/**
+ * Extract distinct values in parallel by splitting the file into slices
+ * and merging the per-slice counts. Returns null when the file cannot be
+ * split safely, so the caller can fall back to the streaming path.
+ *
+ * @param {string} filePath - Path to the CSV file
+ * @param {number} columnIndex - Index of the column to count
+ * @param {string} delimiter - CSV delimiter
+ * @returns {Promise<Map<string, number>|null>}
+ */
+async function extractDistinctValuesParallel(filePath, columnIndex, delimiter) {
+    const workerCount = Math.min(Math.max(os.cpus().length, 1), MAX_WORKERS);
+    const split = await findSplitOffsets(filePath, workerCount);
+    if (!split) {
+        return null;
+    }
+
+    const fileSize = fs.statSync(filePath).size;
+    const boundaries = [...split.offsets, fileSize];
+    const tasks = [];
+    for (let i = 0; i + 1 < boundaries.length; i++) {
+        if (boundaries[i] < boundaries[i + 1]) {
+            tasks.push([boundaries[i], boundaries[i + 1]]);
+        }
+    }
+
+    const results = await Promise.all(tasks.map(([start, end]) => new Promise((resolve, reject) => {
+        const worker = new Worker(new URL(import.meta.url), {
+            workerData: {
+                task: 'count-slice',
+                filePath,
+                start,
+                end,
+                columnIndex,
+                delimiter,
+                noQuotes: !split.hasQuotes
+            }
+        });
+        worker.on('message', resolve);
+        worker.on('error', reject);
+        worker.on('exit', (code) => {
+            if (code !== 0) {
+                reject(new Error(`Worker exited with code ${code}`));
+            }
+        });
+    })));
+
+    // Merge the per-slice counts; Map addition is cheap compared to parsing
+    const merged = new Map();
+    for (const pairs of results) {
+        for (const [value, count] of pairs) {
+            merged.set(value, (merged.get(value) || 0) + count);
+        }
+    }
+    return merged;
+}
+
 /**
  * Extract distinct values from the specified column.
  * @param {string} filePath - Path to the CSV file
  * @param {string} columnName - Name of the column to extract values from
  * @param {string} delimiter - CSV delimiter
- * @returns {Promise<{distinctValues: Set<string>, valueCounts: Map<string, number>}|null>}
+ * @returns {Promise<Map<string, number>|null>} Map of value -> occurrence count;
+ *          its keys are the distinct values
  */
 async function extractDistinctValues(filePath, columnName, delimiter = ',') {
+    // Large files are split across worker threads with one counts Map per
+    // slice; small files are not worth the thread startup cost, but can
+    // still skip the CSV state machine entirely when they are quote-free
+    try {
+        const fileSize = fs.statSync(filePath).size;
+        if (fileSize >= PARALLEL_MIN_BYTES) {
+            const columnIndex = await resolveColumnIndex(filePath, columnName, delimiter);
+            if (columnIndex === -1) {
+                return null;
+            }
+            if (columnIndex !== null) {
+                const parallelCounts = await extractDistinctValuesParallel(filePath, columnIndex, delimiter);
+                if (parallelCounts) {
+                    return parallelCounts;
+                }
+            }
+        } else {
+            const headerEnd = await probeQuoteFree(filePath);
+            if (headerEnd !== null) {
+                const columnIndex = await resolveColumnIndex(filePath, columnName, delimiter);
+                if (columnIndex === -1) {
+                    return null;
+                }
+                if (columnIndex !== null) {
+                    return new Map(await countSliceFast(filePath, headerEnd, fileSize, columnIndex, delimiter));
+                }
+            }
+        }
+    } catch (error) {
+        // Fall through to the single-threaded streaming path
+    }
+
     return new Promise((resolve, reject) => {
         try {
-            const fileContent = fs.readFileSync(filePath, 'utf-8');
-            const distinctValues = new Set();
+            // A single Map does double duty: its keys are the distinct
+            // values, so a separate Set would just repeat the same hashing
             const valueCounts = new Map();
-            
-            Papa.parse(fileContent, {
-                header: true,
+
+            // Parse without header mode: resolving the column index once and
+            // indexing each row array directly avoids building a keyed object
+            // per row, which dominates the cost when only one column is read.
+            let columnIndex = -1;
+            let isHeaderRow = true;
+            let aborted = false;
+
+            // Stream the file through the parser instead of loading it into
+            // one giant string: only the counts table grows with the input
+            Papa.parse(fs.createReadStream(filePath, { encoding: 'utf-8', highWaterMark: 4 * 1024 * 1024 }), {
+                header: false,
                 delimiter: delimiter,
                 skipEmptyLines: true,
-                step: (results) => {
+                step: (results, parser) => {
                     if (results.errors.length > 0) {
                         console.warn('Parse warnings:', results.errors);
                     }
-                    
+
                     const row = results.data;
-                    
-                    // Check if column exists (only on first row)
-                    if (distinctValues.size === 0 && valueCounts.size === 0) {
-                        if (!(columnName in row)) {
-                            const availableColumns = Object.keys(row);
+
+                    if (isHeaderRow) {
+                        isHeaderRow = false;
+                        columnIndex = row.findIndex(h => h.trim() === columnName);
+                        if (columnIndex === -1) {
                             console.error(`Error: Column '${columnName}' not found!`);
-                            console.error(`Available columns (first 10): ${availableColumns.slice(0, 10).join(', ')}`);
-                            if (availableColumns.length > 10) {
-                                console.error(`... and ${availableColumns.length - 10} more columns`);
+                            console.error(`Available columns (first 10): ${row.slice(0, 10).map(h => h.trim()).join(', ')}`);
+                            if (row.length > 10) {
+                                console.error(`... and ${row.length - 10} more columns`);
                             }
+                            aborted = true;
+                            parser.abort();
                             resolve(null);
-                            return;
                         }
+                        return;
                     }
-                    
-                    const value = row[columnName];
+
+                    // Ragged rows may be shorter than the header
+                    const value = columnIndex < row.length ? row[columnIndex] : undefined;
                     if (value) {
-                        const trimmedValue = value.toString().trim();
+                        const trimmedValue = fastTrim(value);
                         if (trimmedValue) {
-                            distinctValues.add(trimmedValue);
                             valueCounts.set(trimmedValue, (valueCounts.get(trimmedValue) || 0) + 1);
                         }
                     }
                 },
                 complete: () => {
-                    resolve({ distinctValues, valueCounts });
+                    if (!aborted) {
+                        resolve(valueCounts);
+                    }
                 },
                 error: (error) => {
                     console.error(`Error processing file: ${error.message}`);
@@ -321,70 +820,96 @@ async function main() {
     }
     
     // Extract distinct values
-    const result = await extractDistinctValues(csvFile, options.columnName, options.delimiter);
-    
-    if (!result) {
+    const valueCounts = await extractDistinctValues(csvFile, options.columnName, options.delimiter);
+
+    if (!valueCounts) {
         return 1;
     }
-    
-    const { distinctValues, valueCounts } = result;
-    
-    // Prepare output
-    const outputLines = [];
-    
+
+    // Write output incrementally: with millions of distinct values an
+    // accumulated line array would double the memory footprint
+    let sink = null;
+    let sinkError = null;
+    if (options.output) {
+        sink = fs.createWriteStream(options.output, { encoding: 'utf-8' });
+        sink.on('error', (error) => {
+            sinkError = error;
+        });
+    }
+    const writeLine = (line) => {
+        if (sink) {
+            sink.write(line + '\n');
+        } else {
+            console.log(line);
+        }
+    };
+
     if (options.count) {
         let results;
         if (options.sort) {
-            results = Array.from(valueCounts.entries()).sort((a, b) => a[0].localeCompare(b[0]));
+            // A shared Collator avoids the per-comparison locale setup that
+            // makes String.localeCompare slow on large value sets
+            const collator = new Intl.Collator();
+            results = Array.from(valueCounts.entries()).sort((a, b) => collator.compare(a[0], b[0]));
         } else {
             results = Array.from(valueCounts.entries()).sort((a, b) => b[1] - a[1]); // Sort by count desc
         }
-        
-        outputLines.push(`Distinct values in column '${options.columnName}' (with counts):`);
-        outputLines.push(`Total distinct values: ${distinctValues.size}`);
-        outputLines.push('-'.repeat(50));
-        
+
+        writeLine(`Distinct values in column '${options.columnName}' (with counts):`);
+        writeLine(`Total distinct values: ${valueCounts.size}`);
+        writeLine('-'.repeat(50));
+
         for (const [value, count] of results) {
-            outputLines.push(`${String(count).padStart(5, ' ')} | ${value}`);
+            writeLine(`${String(count).padStart(5, ' ')} | ${value}`);
         }
     } else {
         let results;
         if (options.sort) {
-            results = Array.from(distinctValues).sort();
+            results = Array.from(valueCounts.keys()).sort();
         } else {
-            results = Array.from(distinctValues);
+            results = Array.from(valueCounts.keys());
         }
-        
-        outputLines.push(`Distinct values in column '${options.columnName}':`);
-        outputLines.push(`Total distinct values: ${distinctValues.size}`);
-        outputLines.push('-'.repeat(50));
-        
+
+        writeLine(`Distinct values in column '${options.columnName}':`);
+        writeLine(`Total distinct values: ${valueCounts.size}`);
+        writeLine('-'.repeat(50));
+
         for (const value of results) {
-            outputLines.push(value);
+            writeLine(value);
         }
     }
-    
-    // Output results
-    if (options.output) {
-        try {
-            fs.writeFileSync(options.output, outputLines.join('\n'), 'utf-8');
-            console.log(`Results written to: ${options.output}`);
-        } catch (error) {
-            console.error(`Error writing to file: ${error.message}`);
+
+    if (sink) {
+        await new Promise(resolve => sink.end(resolve));
+        if (sinkError) {
+            console.error(`Error writing to file: ${sinkError.message}`);
             return 1;
         }
-    } else {
-        outputLines.forEach(line => console.log(line));
+        console.log(`Results written to: ${options.output}`);
     }
-    
+
     return 0;
 }
 
 // Export the functions for potential use as a module
 export { extractDistinctValues, getCsvHeaders, findCatalogProductFile };
 
+// Worker-thread entry point for parallel extraction. Quote-free files
+// take the direct line scanner; anything else goes through Papa Parse.
+if (!isMainThread && workerData && workerData.task === 'count-slice') {
+    const countFn = workerData.noQuotes ? countSliceFast : countSlice;
+    const pairs = await countFn(
+        workerData.filePath,
+        workerData.start,
+        workerData.end,
+        workerData.columnIndex,
+        workerData.delimiter
+    );
+    parentPort.postMessage(pairs);
+}
+
 // Run main function if this script is executed directly
-if (import.meta.url === `file://${process.argv[1]}`) {
+if (isMainThread && import.meta.url === `file://${process.argv[1]}`) {
     const exitCode = await main();
     process.exit(exitCode);
 }
\ No newline at end of file
@@ -1,6 +1,20 @@
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
 from langdetect import detect, DetectorFactory
 
+# fasttext è opzionale: se installato (insieme al modello lid.176.bin)
+# il rilevamento avviene in batch in codice nativo, molto più veloce
+# del loop riga per riga di langdetect.
+try:
+    import fasttext
+except ImportError:
+    fasttext = None
+
 # Fix per avere risultati consistenti con langdetect
 DetectorFactory.seed = 0
 
@@ -11,41 +25,152 @@ OUTPUT_OTHER = "non_italiano.csv"  # Tutti gli altri
 OUTPUT_EMPTY = "vuoti.csv"      # Colonna H vuota o solo spazi
 COLUMN = "description"  # Nome della colonna da controllare
               # Se intendi "ottava colonna" a prescindere dal nome, useresti df.columns[7]
+FASTTEXT_MODEL = os.environ.get("FASTTEXT_MODEL", "lid.176.bin")  # Modello fastText
+CHUNK_SIZE = 100_000  # Righe per blocco: la memoria resta O(blocco), non O(file)
+DETECT_MAX_CHARS = 400  # langdetect scala con la lunghezza: bastano i primi caratteri
 
-def detect_lang_safe(text):
-    """Ritorna la lingua rilevata oppure 'unknown'."""
-    if not isinstance(text, str) or text.strip() == "":
-        return "empty"
+# Prefiltro: stopword inequivocabilmente italiane o inglesi. Se una di
+# queste compare nel testo evitiamo del tutto la chiamata al rilevatore.
+IT_RE = re.compile(r"\b(della|degli|perché|però|più|prodotto|questo|nostro|è)\b", re.IGNORECASE)
+EN_RE = re.compile(r"\b(the|this|with|and|our|these|which)\b", re.IGNORECASE)
+
+def prefilter_lang(text):
+    """Classificazione rapida tramite stopword; None se il testo è ambiguo."""
+    if IT_RE.search(text):
+        return "it"
+    if EN_RE.search(text):
+        return "en"
+    return None
+
+def load_fasttext_model():
+    """Carica il modello fastText se disponibile, altrimenti ritorna None."""
+    if fasttext is None or not os.path.exists(FASTTEXT_MODEL):
+        return None
+    return fasttext.load_model(FASTTEXT_MODEL)
+
+def detect_langs_batch(texts, model):
+    """Rileva la lingua di una lista di testi con una sola chiamata batch."""
+    # fastText non accetta newline nei testi
+    cleaned = [t.replace("\n", " ") for t in texts]
+    labels, _ = model.predict(cleaned, k=1)
+    return [label[0].replace("__label__", "") for label in labels]
+
+@lru_cache(maxsize=200_000)
+def _detect_cached(text):
+    """langdetect memoizzata: le descrizioni duplicate (varianti dello
+    stesso prodotto) vengono rilevate una volta sola."""
     try:
         return detect(text)
     except:
         return "unknown"
 
+def _detect_or_unknown(text):
+    """langdetect su un testo già non vuoto; 'unknown' se fallisce."""
+    # Il punteggio n-gram di langdetect è lineare nella lunghezza del
+    # testo: per descrizioni lunghe bastano i primi caratteri (e il
+    # troncamento aumenta anche i hit della cache)
+    return _detect_cached(text[:DETECT_MAX_CHARS])
+
+def detect_lang_safe(text):
+    """Ritorna la lingua rilevata oppure 'unknown'."""
+    if not isinstance(text, str) or text.strip() == "":
+        return "empty"
+    return prefilter_lang(text) or _detect_or_unknown(text)
+
+def detect_langs_column(serie, model):
+    """Ritorna le lingue rilevate per una Serie di testi."""
+    # Pulizia e controllo "vuoto" vettorializzati: le celle vuote non
+    # arrivano mai al codice Python riga per riga
+    s = serie.fillna("").astype(str).str.strip()
+    langs = np.full(len(s), "empty", dtype=object)
+    mask = s.ne("").to_numpy()
+    testi = s.to_numpy(dtype=object)[mask].tolist()
+
+    # Prefiltro sulle stopword, poi rilevo solo i testi ancora ambigui
+    rilevate = [None] * len(testi)
+    ambigui = []
+    for j, t in enumerate(testi):
+        lang = prefilter_lang(t)
+        if lang:
+            rilevate[j] = lang
+        else:
+            ambigui.append(j)
+    if testi:
+        print(f"   Prefiltro: {len(testi) - len(ambigui)} su {len(testi)} "
+              f"testi classificati senza rilevatore")
+    if ambigui:
+        if model is not None:
+            # Un'unica chiamata batch, deduplicando i testi: i cataloghi
+            # sono pieni di descrizioni ripetute tra le varianti
+            testi_ambigui = [testi[j] for j in ambigui]
+            unici = list(dict.fromkeys(testi_ambigui))
+            lingue = dict(zip(unici, detect_langs_batch(unici, model)))
+            risultati = [lingue[t] for t in testi_ambigui]
+        else:
+            risultati = [_detect_or_unknown(testi[j]) for j in ambigui]
+        for j, lang in zip(ambigui, risultati):
+            rilevate[j] = lang
+
+    langs[mask] = rilevate
+    return langs
+
 def main():
-    print("📂 Carico il CSV...")
-    df = pd.read_csv(INPUT_FILE)
+    model = load_fasttext_model()
+    if model is not None:
+        print("🌍 Rilevamento lingua con fastText (batch)")
+    else:
+        print("🌍 Rilevamento lingua con langdetect (riga per riga)")
+
+    # Elaboro a blocchi: la memoria resta proporzionale al blocco e i file
+    # di output crescono man mano, senza tenere tre DataFrame in RAM
+    print(f"📂 Elaboro il CSV a blocchi di {CHUNK_SIZE} righe...")
+    righe = {"it": 0, "other": 0, "empty": 0}
+    primo_blocco = True
+
+    # Buffer da 1 MiB sugli output: molte meno syscall di scrittura.
+    # Un thread per file di output: le tre scritture sono indipendenti e
+    # pandas rilascia il GIL durante l'I/O.
+    with ThreadPoolExecutor(max_workers=3) as executor, \
+         open(OUTPUT_IT, "w", encoding="utf-8", newline="", buffering=1024 * 1024) as f_it, \
+         open(OUTPUT_OTHER, "w", encoding="utf-8", newline="", buffering=1024 * 1024) as f_other, \
+         open(OUTPUT_EMPTY, "w", encoding="utf-8", newline="", buffering=1024 * 1024) as f_empty:
+        handle = {"it": f_it, "other": f_other, "empty": f_empty}
+
+        # dtype=str e keep_default_na=False: i valori passano al CSV di
+        # output esattamente come sono nell'input, senza inferenza dei tipi
+        # per blocco che cambierebbe il formato a cavallo dei blocchi
+        for df in pd.read_csv(INPUT_FILE, chunksize=CHUNK_SIZE,
+                              dtype=str, keep_default_na=False):
+            if primo_blocco and COLUMN not in df.columns:
+                raise ValueError(f"La colonna '{COLUMN}' non esiste nel file CSV! "
+                                 f"Colonne disponibili: {list(df.columns)}")
 
-    if COLUMN not in df.columns:
-        raise ValueError(f"La colonna '{COLUMN}' non esiste nel file CSV! "
-                         f"Colonne disponibili: {list(df.columns)}")
+            df["lang"] = detect_langs_column(df[COLUMN], model)
 
-    print("🌍 Riconosco la lingua nella colonna H...")
-    df["lang"] = df[COLUMN].apply(detect_lang_safe)
+            # Un solo passaggio sul blocco: classifico ogni riga in uno dei
+            # tre bucket e raggruppo, invece di tre filtri booleani separati
+            df["bucket"] = np.where(df["lang"] == "it", "it",
+                                    np.where(df["lang"] == "empty", "empty", "other"))
 
-    # Filtri
-    df_it = df[df["lang"] == "it"].drop(columns=["lang"])
-    df_other = df[(df["lang"] != "it") & (df["lang"] != "empty")].drop(columns=["lang"])
-    df_empty = df[df["lang"] == "empty"].drop(columns=["lang"])
+            if primo_blocco:
+                intestazione = df.drop(columns=["lang", "bucket"]).head(0)
+                for f in handle.values():
+                    intestazione.to_csv(f, index=False)
+                primo_blocco = False
 
-    print("💾 Salvo i file...")
-    df_it.to_csv(OUTPUT_IT, index=False)
-    df_other.to_csv(OUTPUT_OTHER, index=False)
-    df_empty.to_csv(OUTPUT_EMPTY, index=False)
+            gruppi = [(nome, sub.drop(columns=["lang", "bucket"]))
+                      for nome, sub in df.groupby("bucket", sort=False)]
+            attese = [executor.submit(sub.to_csv, handle[nome], index=False, header=False)
+                      for nome, sub in gruppi]
+            for attesa in attese:
+                attesa.result()
+            for nome, sub in gruppi:
+                righe[nome] += len(sub)
 
     print(f"✅ Fatto! Salvati:\n"
-          f"- {OUTPUT_IT} ({len(df_it)} righe)\n"
-          f"- {OUTPUT_OTHER} ({len(df_other)} righe)\n"
-          f"- {OUTPUT_EMPTY} ({len(df_empty)} righe)")
+          f"- {OUTPUT_IT} ({righe['it']} righe)\n"
+          f"- {OUTPUT_OTHER} ({righe['other']} righe)\n"
+          f"- {OUTPUT_EMPTY} ({righe['empty']} righe)")
 
 if __name__ == "__main__":
     main()